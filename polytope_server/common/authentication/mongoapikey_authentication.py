@@ -44,7 +44,9 @@ class ApiKeyMongoAuthentication(authentication.Authentication):
         username = config.get("username")
         password = config.get("password")
 
-        self.mongo_client = mongo_client_factory.create_client(uri, username, password)
+        self.mongo_client = mongo_client_factory.create_client(
+            uri, username, password, **mongo_client_factory.pool_options(config)
+        )
         self.database = self.mongo_client.keys
         self.keys = self.database[collection]
         assert realm == "polytope"
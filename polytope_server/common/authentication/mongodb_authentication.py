@@ -37,7 +37,9 @@ class MongoAuthentication(authentication.Authentication):
         username = config.get("username")
         password = config.get("password")
 
-        self.mongo_client = mongo_client_factory.create_client(uri, username, password)
+        self.mongo_client = mongo_client_factory.create_client(
+            uri, username, password, **mongo_client_factory.pool_options(config)
+        )
         self.database = self.mongo_client.authentication
         self.users = self.database[collection]
 
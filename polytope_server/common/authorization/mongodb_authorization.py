@@ -33,7 +33,9 @@ class MongoDBAuthorization(authorization.Authorization):
         username = config.get("username")
         password = config.get("password")
 
-        self.mongo_client = mongo_client_factory.create_client(self.uri, username, password)
+        self.mongo_client = mongo_client_factory.create_client(
+            self.uri, username, password, **mongo_client_factory.pool_options(config)
+        )
         self.database = self.mongo_client.authentication
         self.users = self.database[self.collection]
 
@@ -25,6 +25,7 @@ import io
 import logging
 import pickle
 import socket
+import sys
 from abc import ABC, abstractmethod
 from typing import Dict, Union
 
@@ -42,6 +43,7 @@ from ..metric_collector import (
     MongoStorageMetricCollector,
     RedisCacheMetricCollector,
     RedisStorageMetricCollector,
+    SizedDict,
 )
 from ..request import Status
 
@@ -83,7 +85,8 @@ class GlobalVarCaching(Caching):
     def __init__(self, cache_config):
         super().__init__(cache_config)
         self.config = cache_config
-        self.store = {}
+        # cached objects are pickled bytes, so the size of the data is their actual footprint
+        self.store = SizedDict(sizeof=lambda entry: sys.getsizeof(entry["data"]))
         host = socket.gethostname()
         self.storage_metric_collector = DictStorageMetricCollector(host, self.store)
         self.cache_metric_collector = GlobalVarCacheMetricCollector()
@@ -106,7 +109,7 @@ class GlobalVarCaching(Caching):
             self.store[key] = {"data": object, "expiry": expiry}
 
     def wipe(self):
-        self.store = {}
+        self.store.clear()
 
     def collect_metric_info(self):
         metric = self.cache_metric_collector.collect().serialize()
@@ -205,6 +208,7 @@ class MongoDBCaching(Caching):
             uri,
             username,
             password,
+            **mongo_client_factory.pool_options(cache_config),
         )
 
         self.database = self.client.cache
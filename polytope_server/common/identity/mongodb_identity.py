@@ -38,6 +38,7 @@ class MongoDBIdentity(identity.Identity):
             self.uri,
             username,
             password,
+            **mongo_client_factory.pool_options(config),
         )
         self.database = self.mongo_client.authentication
         self.users = self.database[self.collection]
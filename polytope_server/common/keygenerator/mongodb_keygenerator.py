@@ -38,7 +38,9 @@ class MongoKeyGenerator(keygenerator.KeyGenerator):
         username = config.get("username")
         password = config.get("password")
 
-        self.mongo_client = mongo_client_factory.create_client(uri, username, password)
+        self.mongo_client = mongo_client_factory.create_client(
+            uri, username, password, **mongo_client_factory.pool_options(config)
+        )
         self.database = self.mongo_client.keys
         self.keys = self.database[collection]
         self.realms = config.get("allowed_realms")
@@ -64,8 +64,16 @@ class MongoCacheMetricCollector(CacheMetricCollector):
         self.client = client
         self.store = getattr(self.client, database)[collection]
 
+    def collect(self):
+        counters = self.counters()
+        return CacheInfo(hits=counters["hits"], misses=counters["misses"])
+
+    def counters(self):
+        """Fetch both the hits and misses counters in a single round-trip"""
+        return {doc["_id"]: doc["n"] for doc in self.store.find({"_id": {"$in": ["hits", "misses"]}}, {"n": 1})}
+
     def hits(self):
-        return self.store.find_one({"_id": "hits"})["n"]
+        return self.counters()["hits"]
 
     def misses(self):
-        return self.store.find_one({"_id": "misses"})["n"]
+        return self.counters()["misses"]
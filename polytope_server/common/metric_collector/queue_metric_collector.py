@@ -40,13 +40,33 @@ class RabbitmqQueueMetricCollector(QueueMetricCollector):
         self.host = host
         self.parameters = parameters
         self.queue_name = queue_name
+        self.connection = None
+        self.channel = None
 
     def total_queued(self):
-        connection = pika.BlockingConnection(self.parameters)
-        channel = connection.channel()
-        q = channel.queue_declare(queue=self.queue_name, durable=True, passive=True)
+        try:
+            q = self.declare()
+        except pika.exceptions.AMQPError:
+            # The kept connection may have been dropped by the server since the last call, retry once on a new one
+            self.channel = None
+            q = self.declare()
         return q.method.message_count
 
+    def declare(self):
+        """Passively declare the queue, reusing the connection and channel of previous calls"""
+        if self.connection is None or not self.connection.is_open:
+            self.connection = pika.BlockingConnection(self.parameters)
+            self.channel = None
+        if self.channel is None or not self.channel.is_open:
+            self.channel = self.connection.channel()
+        return self.channel.queue_declare(queue=self.queue_name, durable=True, passive=True)
+
+    def close(self):
+        if self.connection is not None and self.connection.is_open:
+            self.connection.close()
+        self.connection = None
+        self.channel = None
+
 
 class SQSQueueMetricCollector(QueueMetricCollector):
     def __init__(self, host, client):
@@ -18,7 +18,9 @@
 # does it submit to any jurisdiction.
 #
 
+import collections.abc
 import sys
+from concurrent.futures import ThreadPoolExecutor
 
 from ..metric import MongoStorageInfo, S3StorageInfo, StorageInfo
 from . import MetricCollector
@@ -56,12 +58,52 @@ class StorageMetricCollector(MetricCollector):
         return "not implemented"
 
 
+class SizedDict(collections.abc.MutableMapping):
+    """A dict-like mapping keeping a running total of the size of its values, as measured by 'sizeof'"""
+
+    def __init__(self, *args, sizeof=sys.getsizeof, **kwargs):
+        self.sizeof = sizeof
+        self.size = 0
+        self._data = {}
+        self.update(*args, **kwargs)
+
+    def __getitem__(self, key):
+        return self._data[key]
+
+    def __setitem__(self, key, value):
+        if key in self._data:
+            self.size -= self.sizeof(self._data[key])
+        self._data[key] = value
+        self.size += self.sizeof(value)
+
+    def __delitem__(self, key):
+        self.size -= self.sizeof(self._data.pop(key))
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __len__(self):
+        return len(self._data)
+
+    def __repr__(self):
+        return "{}({!r})".format(type(self).__name__, self._data)
+
+    def clear(self):
+        self._data.clear()
+        self.size = 0
+
+
 class DictStorageMetricCollector(StorageMetricCollector):
     def __init__(self, host, dictionary):
         super().__init__(host, "dict")
         self.dictionary = dictionary
 
     def storage_space_used(self):
+        if isinstance(self.dictionary, SizedDict):
+            return self.dictionary.size
         return sys.getsizeof(self.dictionary)
 
     def total_entries(self):
@@ -106,19 +148,21 @@ class MongoStorageMetricCollector(StorageMetricCollector):
         return m
 
     def storage_space_used(self):
-        space_used = 0
-        for db in self.client.list_database_names():
-            space_used += int(getattr(self.client, db).command({"dbStats": 1}).get("storageSize"))
-        return space_used
+        # dbStats is issued per database, run them concurrently over the client's connection pool
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            return sum(executor.map(self._db_storage_size, self.client.list_database_names()))
+
+    def _db_storage_size(self, db):
+        return int(getattr(self.client, db).command({"dbStats": 1}).get("storageSize"))
 
     def total_entries(self):
-        return self.store.count_documents({})
+        return self.store.estimated_document_count()
 
     def db_name(self):
         return self.database
 
     def db_space_used(self):
-        return int(getattr(self.client, self.database).command({"dbStats": 1}).get("storageSize"))
+        return self._db_storage_size(self.database)
 
     def db_space_limit(self):
         return "not implemented"
@@ -132,36 +176,46 @@ class S3StorageMetricCollector(StorageMetricCollector):
         self.client_type = client_type
 
     def collect(self):
-        r = super().collect()
-        m = S3StorageInfo(
-            from_dict=r.serialize(),
-            bucket_space_used=self.bucket_space_used(),
+        # list the bucket once for both its number of entries and the space it uses
+        entries, space_used = self._bucket_usage()
+        return S3StorageInfo(
+            storage_host=self.host,
+            storage_type=self.storage_type,
+            storage_space_used=self.storage_space_used(),
+            storage_space_limit=self.storage_space_limit(),
+            device_space_used=self.device_space_used(),
+            device_space_limit=self.device_space_limit(),
+            entries=entries,
+            bucket_space_used=space_used,
             bucket_space_limit=self.bucket_space_limit(),
             bucket_name=self.bucket_name(),
         )
-        return m
 
     def total_entries(self):
-        if self.client_type == "S3DataStaging_boto3":
-            # boto3 only accepts keyword arguments
-            return len(list(self.client.list_objects_v2(Bucket=self.bucket)))
-        else:
-            return len(list(self.client.list_objects(self.bucket)))
+        return self._bucket_usage()[0]
 
     def bucket_name(self):
         return self.bucket
 
     def bucket_space_used(self):
-        size = 0
+        return self._bucket_usage()[1]
+
+    def _bucket_usage(self):
+        entries = size = 0
         if self.client_type == "S3DataStaging_boto3":
-            # boto3 only accepts keyword arguments
-            for o in self.client.list_objects_v2(Bucket=self.bucket)["Contents"]:
-                size += o["Size"]
-            return size
+            for page in self._pages():
+                entries += page.get("KeyCount", 0)
+                size += sum(o["Size"] for o in page.get("Contents", []))
         else:
             for o in self.client.list_objects(self.bucket):
+                entries += 1
                 size += o.size
-            return size
+        return entries, size
+
+    def _pages(self):
+        # boto3 only accepts keyword arguments
+        # list_objects_v2 returns at most 1000 keys per call, iterate over all pages without holding them
+        return self.client.get_paginator("list_objects_v2").paginate(Bucket=self.bucket)
 
     def bucket_space_limit(self):
         return "not implemented"
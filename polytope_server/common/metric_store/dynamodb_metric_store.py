@@ -18,17 +18,21 @@
 # does it submit to any jurisdiction.
 #
 
+import functools
+import itertools
 import logging
 import operator
+import threading
 import warnings
 from decimal import Decimal
 from enum import Enum
-from functools import reduce
 
 import boto3
 import botocore
+import botocore.config
 import botocore.exceptions
 from boto3.dynamodb.conditions import Attr, Key
+from boto3.dynamodb.types import TypeDeserializer, TypeSerializer
 
 from ..metric import (
     CacheInfo,
@@ -55,6 +59,63 @@ METRIC_TYPE_CLASS_MAP = {
 }
 
 
+_serializer = TypeSerializer()
+_deserializer = TypeDeserializer()
+
+_boto_config = botocore.config.Config(
+    max_pool_connections=64,
+    tcp_keepalive=True,
+    retries={"mode": "adaptive", "max_attempts": 10},
+)
+
+_local = threading.local()
+_clients = {}
+_dax_clients = {}
+_clients_lock = threading.Lock()
+
+
+def _get_client(region, endpoint_url):
+    """Share one low-level client, and so one connection pool, between all metric stores of the process. Clients are
+    thread-safe. This must be a client of its own: the client of a resource (resource.meta.client) serializes
+    parameters itself, so it would serialize items twice."""
+    key = (region, endpoint_url)
+    with _clients_lock:
+        if key not in _clients:
+            session = boto3.session.Session()
+            _clients[key] = session.client(
+                "dynamodb", region_name=region, endpoint_url=endpoint_url, config=_boto_config
+            )
+        return _clients[key]
+
+
+def _get_dax_client(region, dax_endpoint):
+    """Share one DAX client per cluster, since creating one discovers the cluster's nodes. Like the low-level boto3
+    client it is thread-safe."""
+    import amazondax
+
+    key = (region, dax_endpoint)
+    with _clients_lock:
+        if key not in _dax_clients:
+            _dax_clients[key] = amazondax.AmazonDaxClient(endpoint_url=dax_endpoint, region_name=region)
+        return _dax_clients[key]
+
+
+def _get_table(region, endpoint_url, table_name, dax_endpoint=None):
+    """Resources are not thread-safe, so each thread builds its own, reused by all metric stores used in that thread"""
+    tables = _local.__dict__.setdefault("tables", {})
+    key = (region, endpoint_url, table_name, dax_endpoint)
+    if key not in tables:
+        if dax_endpoint:
+            import amazondax
+
+            dynamodb = amazondax.AmazonDaxClient.resource(endpoint_url=dax_endpoint, region_name=region)
+        else:
+            session = boto3.session.Session()
+            dynamodb = session.resource("dynamodb", region_name=region, endpoint_url=endpoint_url, config=_boto_config)
+        tables[key] = dynamodb.Table(table_name)
+    return tables[key]
+
+
 def _iter_items(fn, **params):
     while True:
         response = fn(**params)
@@ -71,23 +132,32 @@ def _make_query(**kwargs):
     }
 
 
-def _visit(obj, fn):
-    if isinstance(obj, dict):
-        return {key: _visit(value, fn) for key, value in obj.items()}
-    if isinstance(obj, list):
-        return [_visit(value, fn) for value in obj]
-    return fn(obj)
+@functools.lru_cache(maxsize=32)
+def _equality_filter(count):
+    """Filter expression template comparing the attributes #f0..#fN with the values :f0..:fN.
+    The prefix keeps clear of the #n/:v placeholders boto3 generates for key conditions."""
+    return " AND ".join(f"#f{i} = :f{i}" for i in range(count))
 
 
 def _convert_numbers(obj, reverse=False):
-    def fn(item):
-        if not reverse and isinstance(item, float):
-            return Decimal(item)
-        elif reverse and isinstance(item, Decimal):
-            return float(item)
-        return item
-
-    return _visit(obj, fn)
+    """Convert floats to Decimals, or Decimals to floats if reverse, in place in nested dicts and lists.
+    Only use on containers built for the conversion, e.g. serialized metrics or items returned by boto3."""
+    stack = [obj]
+    while stack:
+        container = stack.pop()
+        keys = container.keys() if type(container) is dict else range(len(container))
+        for key in keys:
+            value = container[key]
+            if type(value) is dict or type(value) is list:
+                stack.append(value)
+            elif reverse:
+                if type(value) is Decimal:
+                    container[key] = float(value)
+            elif type(value) is float:
+                # the shortest repr round-trips exactly, whereas the exact binary expansion can exceed
+                # the 38 significant digits accepted by DynamoDB (e.g. 0.1)
+                container[key] = Decimal(repr(value))
+    return obj
 
 
 def _load(item):
@@ -103,12 +173,23 @@ def _dump(metric):
     return item
 
 
-def _create_table(dynamodb, table_name):
+def _serialize(item):
+    """Serialize an item to the DynamoDB attribute value format of the low-level client"""
+    return {key: _serializer.serialize(value) for key, value in item.items()}
+
+
+def _deserialize(item):
+    return {key: _deserializer.deserialize(value) for key, value in item.items()}
+
+
+def _create_table(client, table_name):
     try:
         kwargs = {
             "AttributeDefinitions": [
                 {"AttributeName": "uuid", "AttributeType": "S"},
                 {"AttributeName": "request_id", "AttributeType": "S"},
+                {"AttributeName": "type", "AttributeType": "S"},
+                {"AttributeName": "timestamp", "AttributeType": "N"},
             ],
             "TableName": table_name,
             "KeySchema": [{"AttributeName": "uuid", "KeyType": "HASH"}],
@@ -118,12 +199,20 @@ def _create_table(dynamodb, table_name):
                     "KeySchema": [{"AttributeName": "request_id", "KeyType": "HASH"}],
                     "Projection": {"ProjectionType": "ALL"},
                 },
+                {
+                    "IndexName": "type-index",
+                    "KeySchema": [
+                        {"AttributeName": "type", "KeyType": "HASH"},
+                        {"AttributeName": "timestamp", "KeyType": "RANGE"},
+                    ],
+                    "Projection": {"ProjectionType": "ALL"},
+                },
             ],
             "BillingMode": "PAY_PER_REQUEST",
         }
-        table = dynamodb.create_table(**kwargs)
-        table.wait_until_exists()
-    except dynamodb.meta.client.exceptions.ResourceInUseException:
+        client.create_table(**kwargs)
+        client.get_waiter("table_exists").wait(TableName=table_name)
+    except client.exceptions.ResourceInUseException:
         pass
 
 
@@ -136,23 +225,47 @@ class DynamoDBMetricStore(MetricStore):
         region = config.get("region")
         table_name = config.get("table_name", "metrics")
 
-        dynamodb = boto3.resource("dynamodb", region_name=region, endpoint_url=endpoint_url)
-        client = dynamodb.meta.client
-        self.table = dynamodb.Table(table_name)
+        client = _get_client(region, endpoint_url)
+        # the hot single-item paths use the low-level client, skipping the resource layer's per-call overhead
+        self.client = client
+        self.region = region
+        self.endpoint_url = endpoint_url
+        self.table_name = table_name
 
         try:
             response = client.describe_table(TableName=table_name)
             if response["Table"]["TableStatus"] != "ACTIVE":
                 raise RuntimeError(f"DynamoDB table {table_name} is not active.")
         except client.exceptions.ResourceNotFoundException:
-            _create_table(dynamodb, table_name)
+            _create_table(client, table_name)
+            response = client.describe_table(TableName=table_name)
+
+        # tables created by older versions may lack some of the secondary indexes
+        self.indexes = {index["IndexName"] for index in response["Table"].get("GlobalSecondaryIndexes", [])}
+
+        self.dax_endpoint = config.get("dax_endpoint")
+        if self.dax_endpoint:
+            # Serve reads from a DAX cluster in front of the table. Writes go through it as well, so that its
+            # item cache stays coherent. DAX only handles data-plane calls, the table is managed above.
+            self.client = _get_dax_client(region, self.dax_endpoint)
+            logger.info("DynamoDB metric store using DAX endpoint %s.", self.dax_endpoint)
+
+    @property
+    def table(self):
+        # stores may be built and used in different threads, so look up the table of the calling thread on each use
+        return _get_table(self.region, self.endpoint_url, self.table_name, self.dax_endpoint)
 
     def get_type(self):
         return "dynamodb"
 
     def add_metric(self, metric):
         try:
-            self.table.put_item(Item=_dump(metric), ConditionExpression=Attr("uuid").not_exists())
+            self.client.put_item(
+                TableName=self.table_name,
+                Item=_serialize(_dump(metric)),
+                ConditionExpression="attribute_not_exists(#uuid)",
+                ExpressionAttributeNames={"#uuid": "uuid"},
+            )
         except botocore.exceptions.ClientError as e:
             if e.response["Error"]["Code"] == "ConditionalCheckFailedException":
                 raise ValueError("Request already exists in request store") from e
@@ -166,40 +279,63 @@ class DynamoDBMetricStore(MetricStore):
                 raise KeyError("Request does not exist in request store") from e
             raise
 
+    def remove_metrics(self, uuids):
+        # the batch writer sends deletes in BatchWriteItem calls of 25 and resends unprocessed items
+        with self.table.batch_writer() as batch:
+            for uuid in uuids:
+                batch.delete_item(Key={"uuid": str(uuid)})
+
     def get_metric(self, uuid):
-        response = self.table.get_item(Key={"uuid": str(uuid)})
+        response = self.client.get_item(TableName=self.table_name, Key={"uuid": {"S": str(uuid)}})
         if "Item" in response:
-            return _load(response["Item"])
+            return _load(_deserialize(response["Item"]))
 
     def get_metrics(self, ascending=None, descending=None, limit=None, request_id=None, **kwargs):
         if ascending is not None and descending is not None:
             raise ValueError("Cannot sort by ascending and descending at the same time.")
 
+        query = _make_query(**kwargs)
         if request_id is not None:
             fn = self.table.query
             params = {
                 "IndexName": "request-index",
                 "KeyConditionExpression": Key("request_id").eq(request_id),
             }
+        elif "type" in query and "type-index" in self.indexes:
+            fn = self.table.query
+            params = {
+                "IndexName": "type-index",
+                "KeyConditionExpression": Key("type").eq(query.pop("type")),
+            }
         else:
             fn = self.table.scan
             params = {}
 
-        if limit is not None:
-            params["Limit"] = limit
-
-        if query := _make_query(**kwargs):
-            params["FilterExpression"] = reduce(operator.__and__, (Attr(key).eq(value) for key, value in query.items()))
-
-        items = (_load(item) for item in _iter_items(fn, **params))
-        if ascending is not None:
-            return sorted(items, key=lambda item: getattr(item, ascending))
-        if descending is not None:
-            return sorted(items, key=lambda item: getattr(item, descending), reverse=True)
-        return list(items)
+        if query:
+            params["FilterExpression"] = _equality_filter(len(query))
+            params["ExpressionAttributeNames"] = {f"#f{i}": key for i, key in enumerate(query)}
+            params["ExpressionAttributeValues"] = {f":f{i}": value for i, value in enumerate(query.values())}
+
+        sort_key = ascending if ascending is not None else descending
+        if params.get("IndexName") == "type-index" and sort_key == "timestamp":
+            # the range key of the index already orders the items by timestamp
+            params["ScanIndexForward"] = descending is None
+            sort_key = None
+
+        if sort_key is None:
+            # items arrive in their final order, so stop paging as soon as enough of them have been read
+            if limit is not None:
+                params["Limit"] = limit
+            return [_load(item) for item in itertools.islice(_iter_items(fn, **params), limit)]
+
+        # sort and truncate the raw items, whose values are plain Decimals and strings, and only build metrics from
+        # the ones that are kept
+        items = list(_iter_items(fn, **params))
+        items.sort(key=operator.itemgetter(sort_key), reverse=descending is not None)
+        return [_load(item) for item in items[:limit]]
 
     def update_metric(self, metric):
-        self.table.put_item(Item=_dump(metric))
+        self.client.put_item(TableName=self.table_name, Item=_serialize(_dump(metric)))
 
     def wipe(self):
         warnings.warn("wipe is not implemented for DynamoDBMetricStore")
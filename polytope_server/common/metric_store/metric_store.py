@@ -20,7 +20,7 @@
 
 import importlib
 from abc import ABC, abstractmethod
-from typing import Dict, List, Union
+from typing import Dict, Iterable, Iterator, List, Union
 
 from ..metric import Metric, MetricType
 from ..request import Status
@@ -36,6 +36,11 @@ class MetricStore(ABC):
     def add_metric(self, metric: Metric) -> None:
         """Add a metric to the request store"""
 
+    def add_metrics(self, metrics: Iterable[Metric]) -> None:
+        """Add several metrics to the metric store"""
+        for metric in metrics:
+            self.add_metric(metric)
+
     @abstractmethod
     def get_metric(self, uuid: str) -> Metric:
         """Fetch metric from the metric store"""
@@ -45,14 +50,31 @@ class MetricStore(ABC):
         """Returns [limit] metrics which match kwargs, ordered by
         ascending/descenging keys (e.g. ascending = 'timestamp')"""
 
+    def iter_metrics(self, ascending=None, descending=None, limit=None, **kwargs) -> Iterator[Metric]:
+        """Same as get_metrics, but yields metrics as they are read instead of returning a list"""
+        return iter(self.get_metrics(ascending=ascending, descending=descending, limit=limit, **kwargs))
+
     @abstractmethod
     def remove_metric(self, uuid: str) -> None:
         """Remove a metric from the metric store"""
 
+    def remove_metrics(self, uuids: Iterable[str]) -> None:
+        """Remove several metrics from the metric store, ignoring those which do not exist"""
+        for uuid in uuids:
+            try:
+                self.remove_metric(uuid)
+            except KeyError:
+                pass
+
     # @abstractmethod
     # def update_metric(self, metric: Metric) -> None:
     #    """ Updates a stored metric """
 
+    def update_metrics(self, metrics: Iterable[Metric]) -> None:
+        """Update several stored metrics"""
+        for metric in metrics:
+            self.update_metric(metric)
+
     @abstractmethod
     def get_type(self) -> str:
         """Returns the type of the metric_store in use"""
@@ -76,9 +98,10 @@ def create_metric_store(metric_store_config=None):
     if metric_store_config is None:
         metric_store_config = {"mongodb": {}}
 
-    db_type = next(iter(metric_store_config.keys()))
+    db_type, db_config = next(iter(metric_store_config.items()))
 
-    assert db_type in type_to_class_map.keys()
+    if db_type not in type_to_class_map:
+        raise ValueError("Unsupported metric store type {}".format(db_type))
 
     MetricStoreClass = importlib.import_module("polytope_server.common.metric_store." + db_type + "_metric_store")
-    return getattr(MetricStoreClass, type_to_class_map[db_type])(metric_store_config.get(db_type))
+    return getattr(MetricStoreClass, type_to_class_map[db_type])(db_config)
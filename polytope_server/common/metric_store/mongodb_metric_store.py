@@ -18,9 +18,11 @@
 # does it submit to any jurisdiction.
 #
 
+import functools
 import logging
 
 import pymongo
+from pymongo.write_concern import WriteConcern
 
 from .. import mongo_client_factory
 from ..metric import (
@@ -36,6 +38,30 @@ from ..metric import (
 from ..metric_collector import MongoStorageMetricCollector
 from . import MetricStore
 
+# Indexes serving a query filtering on the given field sorted by timestamp, most selective first
+TIMESTAMP_INDEXES = {
+    "request_id": "ix_request_timestamp",
+    "type": "ix_type_timestamp",
+}
+
+METRIC_TYPE_CLASS_MAP = {
+    MetricType.WORKER_STATUS_CHANGE: WorkerStatusChange,
+    MetricType.WORKER_INFO: WorkerInfo,
+    MetricType.REQUEST_STATUS_CHANGE: RequestStatusChange,
+    MetricType.STORAGE_INFO: StorageInfo,
+    MetricType.CACHE_INFO: CacheInfo,
+    MetricType.QUEUE_INFO: QueueInfo,
+}
+# documents store the type as its serialized value, so look classes up by that directly
+CLASS_BY_TYPE_STR = {k.value: v for k, v in METRIC_TYPE_CLASS_MAP.items()}
+SLOTS_BY_TYPE = {k: frozenset(Metric.__slots__) | frozenset(v.__slots__) for k, v in METRIC_TYPE_CLASS_MAP.items()}
+ALL_SLOTS = frozenset().union(*SLOTS_BY_TYPE.values())
+# serializer of each slot of each metric type, for turning query values into their stored form
+SERIALIZERS = {
+    k: {slot: functools.partial(METRIC_TYPE_CLASS_MAP[k].serialize_slot, slot) for slot in slots}
+    for k, slots in SLOTS_BY_TYPE.items()
+}
+
 
 class MongoMetricStore(MetricStore):
     def __init__(self, config=None):
@@ -51,18 +77,18 @@ class MongoMetricStore(MetricStore):
         username = config.get("username")
         password = config.get("password")
 
-        self.mongo_client = mongo_client_factory.create_client(uri, username, password)
+        self.mongo_client = mongo_client_factory.create_client(
+            uri, username, password, **mongo_client_factory.pool_options(config)
+        )
         self.database = self.mongo_client.metric_store
         self.store = self.database[metric_collection]
+        self._ensure_indexes()
 
-        self.metric_type_class_map = {
-            MetricType.WORKER_STATUS_CHANGE: WorkerStatusChange,
-            MetricType.WORKER_INFO: WorkerInfo,
-            MetricType.REQUEST_STATUS_CHANGE: RequestStatusChange,
-            MetricType.STORAGE_INFO: StorageInfo,
-            MetricType.CACHE_INFO: CacheInfo,
-            MetricType.QUEUE_INFO: QueueInfo,
-        }
+        # Optionally trade durability and error reporting (including duplicate metrics) for write throughput. Metrics
+        # are telemetry, so losing an occasional one is acceptable. Removals stay acknowledged.
+        self.write_store = self.store
+        if config.get("unacknowledged_writes", False):
+            self.write_store = self.store.with_options(write_concern=WriteConcern(w=0))
 
         self.storage_metric_collector = MongoStorageMetricCollector(
             uri, self.mongo_client, "metric_store", metric_collection
@@ -70,42 +96,87 @@ class MongoMetricStore(MetricStore):
 
         logging.info("MongoClient configured to open at {}".format(uri))
 
+    def _ensure_indexes(self):
+        indexes = {
+            # Metric uuids are unique, enforced by the server so that adding a metric takes a single round-trip
+            "uuid_unique": ([("uuid", pymongo.ASCENDING)], {"unique": True}),
+        }
+        for field, name in TIMESTAMP_INDEXES.items():
+            indexes[name] = ([(field, pymongo.ASCENDING), ("timestamp", pymongo.DESCENDING)], {})
+        self.indexes = mongo_client_factory.ensure_indexes(self.store, indexes)
+        self.unique_uuid = "uuid_unique" in self.indexes
+
     def get_type(self):
         return "mongodb"
 
     def add_metric(self, metric):
-        if self.get_metric(metric.uuid) is not None:
+        if not self.unique_uuid and self.store.find_one({"uuid": metric.uuid}, {"_id": True}) is not None:
+            raise ValueError("Metric already exists in metric store")
+        try:
+            self.write_store.insert_one(metric.serialize())
+        except pymongo.errors.DuplicateKeyError:
             raise ValueError("Metric already exists in metric store")
-        self.store.insert_one(metric.serialize())
+
+    def add_metrics(self, metrics):
+        metrics = list(metrics)
+        if not metrics:
+            return
+        if not self.unique_uuid:
+            super().add_metrics(metrics)
+            return
+        docs = [metric.serialize() for metric in metrics]
+        try:
+            # unordered, so that the server inserts every metric it can rather than stopping at the first duplicate
+            self.write_store.insert_many(docs, ordered=False)
+        except pymongo.errors.BulkWriteError as e:
+            errors = e.details.get("writeErrors", [])
+            if any(error["code"] != 11000 for error in errors):
+                raise
+            raise ValueError("{} of {} metrics already exist in metric store".format(len(errors), len(docs))) from e
 
     def remove_metric(self, uuid):
-        result = self.store.find_one_and_delete({"uuid": uuid})
+        # only existence matters, so don't send the deleted document back
+        result = self.store.find_one_and_delete({"uuid": uuid}, projection={"_id": True})
         if result is None:
             raise KeyError("Metric does not exist in request store")
 
+    def remove_metrics(self, uuids):
+        self.store.delete_many({"uuid": {"$in": list(uuids)}})
+
     def get_metric(self, uuid):
         result = self.store.find_one({"uuid": uuid}, {"_id": False})
         if result:
-            metric = self.metric_type_class_map[result.type](from_dict=result)
+            metric = CLASS_BY_TYPE_STR[result["type"]](from_dict=result)
             return metric
         else:
             return None
 
     def get_metrics(self, ascending=None, descending=None, limit=None, **kwargs):
-        all_slots = []
+        return list(self.iter_metrics(ascending, descending, limit, **kwargs))
 
-        found_type = None
-        for k, v in self.metric_type_class_map.items():
-            class_slots = list(set().union(Metric.__slots__, v.__slots__))
-            if not found_type and all([xi in class_slots for xi in list(kwargs.keys())]):
-                found_type = k
-            all_slots = list(set().union(all_slots, class_slots))
+    def iter_metrics(self, ascending=None, descending=None, limit=None, **kwargs):
+        # not a generator itself, so that invalid keys raise here rather than on the first iteration
+        cursor = self._find(ascending, descending, limit, **kwargs)
+        return mongo_client_factory.iter_documents(cursor, lambda i: CLASS_BY_TYPE_STR[i["type"]](from_dict=i))
 
-        if not found_type:
-            raise KeyError(
-                "The provided keys must be a subset of slots of any of the ",
-                "available metric types.",
-            )
+    def _find(self, ascending=None, descending=None, limit=None, **kwargs):
+        if not kwargs:
+            # an unfiltered query matches every metric type, so there is no type to identify nor value to serialize
+            class_slots = ALL_SLOTS
+        else:
+            keys = kwargs.keys()
+            found_type = None
+            for k, slots in SLOTS_BY_TYPE.items():
+                if keys <= slots:
+                    found_type = k
+                    break
+
+            if not found_type:
+                raise KeyError(
+                    "The provided keys must be a subset of slots of any of the ",
+                    "available metric types.",
+                )
+            class_slots = SLOTS_BY_TYPE[found_type]
 
         if ascending:
             if ascending not in class_slots:
@@ -115,14 +186,9 @@ class MongoMetricStore(MetricStore):
             if descending not in class_slots:
                 raise KeyError("The identified metric type does not have the key {}".format(descending))
 
-        kwargs_to_pop = []
-        for k, v in kwargs.items():
-            if v is None:
-                kwargs_to_pop.append(k)
-                continue
-            kwargs[k] = self.metric_type_class_map[found_type].serialize_slot(k, v)
-        for k in kwargs_to_pop:
-            kwargs.pop(k)
+        if kwargs:
+            serializers = SERIALIZERS[found_type]
+            kwargs = {k: serializers[k](v) for k, v in kwargs.items() if v is not None}
 
         cursor = self.store.find(kwargs, {"_id": False})
 
@@ -135,24 +201,27 @@ class MongoMetricStore(MetricStore):
         if limit is not None:
             cursor.limit(limit)
 
-        cursor_list = list(cursor)
-        if cursor_list:
-            res = []
-            for i in cursor_list:
-                metric = self.metric_type_class_map[MetricType(i.get("type"))](from_dict=i)
-                res.append(metric)
-            return res
-        return []
+        if "timestamp" in (ascending, descending):
+            for field, index in TIMESTAMP_INDEXES.items():
+                if field in kwargs and mongo_client_factory.hint_index(cursor, index, self.indexes):
+                    break
+
+        # fetch results in larger batches than the driver's default first batch of 101 documents
+        return cursor.batch_size(min(limit, 1000) if limit else 1000)
 
     def update_metric(self, metric):
-        return self.store.find_one_and_update(
-            {"uuid": metric.uuid},
-            {"$set": metric.serialize()},
-            return_document=pymongo.ReturnDocument.AFTER,
-        )
+        self.update_metrics([metric])
+
+    def update_metrics(self, metrics):
+        operations = [pymongo.UpdateOne({"uuid": metric.uuid}, {"$set": metric.serialize()}) for metric in metrics]
+        if operations:
+            self.write_store.bulk_write(operations, ordered=False)
 
     def wipe(self):
         self.database.drop_collection(self.store.name)
+        # dropping the collection dropped its indexes, which later queries and inserts rely on
+        mongo_client_factory.forget_indexes(self.store)
+        self._ensure_indexes()
 
     def collect_metric_info(self):
         return self.storage_metric_collector.collect().serialize()
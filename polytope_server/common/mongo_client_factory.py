@@ -1,14 +1,100 @@
+import logging
+import threading
 import typing
 
 import pymongo
 
+# MongoClient is thread-safe and pools its own connections, so stores configured with the same server share one client
+_clients: typing.Dict[tuple, pymongo.MongoClient] = {}
+_clients_lock = threading.Lock()
+# Names of the indexes ensured on each collection, keyed by (client, database, collection). MongoClients compare equal
+# when they point at the same servers.
+_indexes: typing.Dict[tuple, typing.FrozenSet[str]] = {}
+_indexes_lock = threading.Lock()
+
 
 def create_client(
     uri: str,
     username: typing.Optional[str] = None,
     password: typing.Optional[str] = None,
+    max_pool_size: int = 100,
+    min_pool_size: int = 0,
+    max_idle_time_ms: int = 60000,
+    wait_queue_timeout_ms: int = 5000,
 ) -> pymongo.MongoClient:
+    # maxPoolSize bounds the connections of each client, and should be at least the number of threads sharing it
+    kwargs = dict(
+        host=uri,
+        journal=True,
+        connect=False,
+        maxPoolSize=max_pool_size,
+        minPoolSize=min_pool_size,
+        maxIdleTimeMS=max_idle_time_ms,
+        waitQueueTimeoutMS=wait_queue_timeout_ms,
+        retryWrites=True,
+    )
     if username and password:
-        return pymongo.MongoClient(host=uri, journal=True, connect=False, username=username, password=password)
-    else:
-        return pymongo.MongoClient(host=uri, journal=True, connect=False)
+        kwargs.update(username=username, password=password)
+
+    key = tuple(sorted(kwargs.items()))
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            client = _clients[key] = pymongo.MongoClient(**kwargs)
+    return client
+
+
+POOL_OPTIONS = ("max_pool_size", "min_pool_size", "max_idle_time_ms", "wait_queue_timeout_ms")
+
+
+def pool_options(config: typing.Dict[str, typing.Any]) -> typing.Dict[str, int]:
+    """Connection pool options of create_client set in a store's config"""
+    return {option: config[option] for option in POOL_OPTIONS if option in config}
+
+
+def iter_documents(cursor: pymongo.cursor.Cursor, build: typing.Callable) -> typing.Iterator:
+    """Lazily build an object from each document of a cursor. The cursor must be consumed promptly, an idle
+    server-side cursor times out after 10 minutes."""
+    for document in cursor:
+        yield build(document)
+
+
+def hint_index(cursor: pymongo.cursor.Cursor, index: typing.Optional[str], indexes: typing.AbstractSet[str]) -> bool:
+    """Hint an index serving the sort of a cursor, if it exists, so that the sort is not done in memory"""
+    if index is None or index not in indexes:
+        return False
+    cursor.hint(index)
+    return True
+
+
+def ensure_indexes(
+    collection: pymongo.collection.Collection, indexes: typing.Dict[str, tuple]
+) -> typing.FrozenSet[str]:
+    """Create the indexes given as {name: (keys, options)} on a collection, once per process since stores are built
+    often (e.g. for each telemetry request). Indexes which cannot be created are logged rather than failing the store.
+    Returns the names of the indexes which exist."""
+    key = (collection.database.client, collection.database.name, collection.name)
+    with _indexes_lock:
+        if key in _indexes:
+            return _indexes[key]
+        created = set()
+        for name, (keys, options) in indexes.items():
+            try:
+                collection.create_index(keys, name=name, **options)
+            except pymongo.errors.ConnectionFailure as e:
+                # not remembered, the next store built tries again
+                logging.warning("Could not create index {} on {}: {}".format(name, collection.name, e))
+                return frozenset(created)
+            except pymongo.errors.PyMongoError as e:
+                # refused by the server, e.g. missing privileges or existing documents violating a unique constraint
+                logging.warning("Could not create index {} on {}: {}".format(name, collection.name, e))
+            else:
+                created.add(name)
+        _indexes[key] = frozenset(created)
+        return _indexes[key]
+
+
+def forget_indexes(collection: pymongo.collection.Collection) -> None:
+    """Forget the indexes ensured on a collection, e.g. after dropping it, so that they are created again"""
+    with _indexes_lock:
+        _indexes.pop((collection.database.client, collection.database.name, collection.name), None)
@@ -20,12 +20,24 @@
 
 import importlib
 from abc import ABC, abstractmethod
-from typing import Dict, Union
+from typing import Any, Dict, Union
+
+import orjson
 
 from ..metric import MetricType
 from ..request import Status
 
 
+def encode_body(body: Any) -> bytes:
+    """Serialize a message body to JSON"""
+    return orjson.dumps(body, option=orjson.OPT_NON_STR_KEYS)
+
+
+def decode_body(data: Union[bytes, str]) -> Any:
+    """Deserialize a message body from JSON"""
+    return orjson.loads(data)
+
+
 class Message:
     def __init__(self, body, context=None):
         self.body = body
@@ -18,8 +18,8 @@
 # does it submit to any jurisdiction.
 #
 
-import json
 import logging
+import time
 
 import pika
 
@@ -37,6 +37,10 @@ class RabbitmqQueue(queue.Queue):
         self.username = config.get("user", "guest")
         self.password = config.get("password", "guest")
         self.keep_alive_interval = config.get("keep_alive_interval", 30)
+        # How long a message count read from the server is reused for, in seconds
+        self.count_cache_ttl = config.get("count_cache_ttl", 1)
+        self._count = None
+        self._count_time = 0.0
 
         self.credentials = pika.PlainCredentials(self.username, self.password)
 
@@ -64,15 +68,18 @@ class RabbitmqQueue(queue.Queue):
         self.channel.basic_publish(
             exchange="",
             routing_key=self.queue_name,
-            body=json.dumps(message.body).encode("utf-8"),
+            body=queue.encode_body(message.body),
             mandatory=True,
             properties=pika.BasicProperties(delivery_mode=2),
         )
+        # Keep the cached count an upper bound, consumers can only have lowered it since
+        if self._count is not None:
+            self._count += 1
 
     def dequeue(self):
         method, header, body = self.channel.basic_get(queue=self.queue_name)
         if None not in (method, header, body):
-            return queue.Message(json.loads(body.decode("utf-8")), context=method)
+            return queue.Message(queue.decode_body(body), context=method)
         else:
             return None
 
@@ -92,11 +99,16 @@ class RabbitmqQueue(queue.Queue):
         return self.connection.is_open
 
     def count(self):
-        q = self.channel.queue_declare(queue=self.queue_name, durable=True, passive=True)
-        return q.method.message_count
+        now = time.monotonic()
+        if self._count is None or now - self._count_time >= self.count_cache_ttl:
+            q = self.channel.queue_declare(queue=self.queue_name, durable=True, passive=True)
+            self._count = q.method.message_count
+            self._count_time = now
+        return self._count
 
     def close_connection(self):
         self.connection.close()
+        self.queue_metric_collector.close()
 
     def get_type(self):
         return "rabbitmq"
@@ -1,8 +1,10 @@
-import json
 import logging
+import time
+from collections import deque
 from uuid import uuid4
 
 import boto3
+import botocore.exceptions
 
 from ..metric_collector import SQSQueueMetricCollector
 from . import queue
@@ -14,6 +16,12 @@ class SQSQueue(queue.Queue):
         region = config.get("region")
         self.keep_alive_interval = config.get("keep_alive_interval", 60)
         self.visibility_timeout = config.get("visibility_timeout", 120)
+        # Long polling, how long a receive waits for a message to arrive before returning empty (at most 20 seconds)
+        self.wait_time_seconds = config.get("wait_time_seconds", 20)
+        # Receiving several messages per call saves requests, but the extra ones wait in a local buffer while their
+        # visibility timeout runs, so only raise this if messages are processed well within the timeout
+        self.max_number_of_messages = config.get("max_number_of_messages", 1)
+        self.buffer = deque()
 
         logging.getLogger("sqs").setLevel(logging.WARNING)
         logging.getLogger("boto3").setLevel(logging.WARNING)
@@ -29,29 +37,29 @@ class SQSQueue(queue.Queue):
         # Messages need to have different a `MessageGroupId` so that they can be processed in parallel.
         self.client.send_message(
             QueueUrl=self.queue_url,
-            MessageBody=json.dumps(message.body),
+            MessageBody=queue.encode_body(message.body).decode("utf-8"),
             MessageGroupId=message.body.get("id", uuid4()),
         )
 
     def dequeue(self):
-        response = self.client.receive_message(
-            QueueUrl=self.queue_url,
-            VisibilityTimeout=self.visibility_timeout,  # If processing takes more seconds, message will be read twice
-            MaxNumberOfMessages=1,
-            WaitTimeSeconds=20,
-        )
-        if "Messages" not in response:
-            return None
-
-        msg, *remainder = response["Messages"]
-        for item in remainder:
-            self.client.change_message_visibility(
-                QueueUrl=self.queue_url, ReceiptHandle=item["ReceiptHandle"], VisibilityTimeout=0
-            )
-        body = msg["Body"]
-        receipt_handle = msg["ReceiptHandle"]
-
-        return queue.Message(json.loads(body), context=receipt_handle)
+        while True:
+            if not self.buffer:
+                # If processing takes more than the visibility timeout, the message will be read twice
+                response = self.client.receive_message(
+                    QueueUrl=self.queue_url,
+                    VisibilityTimeout=self.visibility_timeout,
+                    MaxNumberOfMessages=self.max_number_of_messages,
+                    WaitTimeSeconds=self.wait_time_seconds,
+                )
+                received = time.monotonic()
+                self.buffer.extend((received, msg) for msg in response.get("Messages", []))
+                if not self.buffer:
+                    return None
+
+            received, msg = self.buffer.popleft()
+            # A message whose visibility timeout expired while buffered may already have been handed to someone else
+            if time.monotonic() - received < self.visibility_timeout:
+                return queue.Message(queue.decode_body(msg["Body"]), context=msg["ReceiptHandle"])
 
     def ack(self, message):
         self.client.delete_message(QueueUrl=self.queue_url, ReceiptHandle=message.context)
@@ -72,6 +80,18 @@ class SQSQueue(queue.Queue):
         return "Attributes" in response and "CreatedTimestamp" in response["Attributes"]
 
     def close_connection(self):
+        # Make buffered messages visible again right away, rather than after their visibility timeout
+        if self.buffer:
+            entries = [
+                {"Id": str(i), "ReceiptHandle": msg["ReceiptHandle"], "VisibilityTimeout": 0}
+                for i, (_, msg) in enumerate(self.buffer)
+            ]
+            self.buffer.clear()
+            try:
+                for i in range(0, len(entries), 10):
+                    self.client.change_message_visibility_batch(QueueUrl=self.queue_url, Entries=entries[i : i + 10])
+            except (botocore.exceptions.BotoCoreError, botocore.exceptions.ClientError) as e:
+                logging.warning("Could not release buffered messages: {}".format(repr(e)))
         self.client.close()
 
     def count(self):
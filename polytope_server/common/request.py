@@ -21,6 +21,7 @@
 import datetime
 import enum
 import logging
+import operator
 import uuid
 
 from .user import User
@@ -40,6 +41,14 @@ class Verb(enum.Enum):
     ARCHIVE = "archive"
 
 
+def _enum_value(value):
+    return value.value
+
+
+def _user_from_dict(value):
+    return User(from_dict=value)
+
+
 class Request:
     """A sealed class representing a request"""
 
@@ -59,11 +68,16 @@ class Request:
         "content_type",
     ]
 
+    _slot_set = frozenset(__slots__)
+    _slot_values = operator.attrgetter(*__slots__)
+    # Serializers and deserializers of the slots not holding plain data types
+    _slot_serializers = {"verb": _enum_value, "status": _enum_value, "user": User.serialize}
+    _slot_deserializers = {"verb": Verb, "status": Status, "user": _user_from_dict}
+
     def __init__(self, from_dict=None, **kwargs):
 
         self.id = str(uuid.uuid4())
-        self.timestamp = datetime.datetime.utcnow().timestamp()
-        self.last_modified = datetime.datetime.utcnow().timestamp()
+        self.timestamp = self.last_modified = datetime.datetime.utcnow().timestamp()
         self.user = None
         self.verb = Verb.RETRIEVE
         self.url = ""
@@ -83,44 +97,32 @@ class Request:
 
     def set_status(self, value):
         self.status = value
-        logging.info("Request ID {} status set to {}.".format(self.id, value.value))
+        logging.info("Request ID %s status set to %s.", self.id, value.value)
 
     @classmethod
     def serialize_slot(cls, key, value):
         if value is None:
             return None
-        if key == "verb":
-            return value.value
-        if key == "status":
-            return value.value
-        if key == "user":
-            return value.serialize()
-        return value
+        serializer = cls._slot_serializers.get(key)
+        return value if serializer is None else serializer(value)
 
     @classmethod
     def deserialize_slot(cls, key, value):
         if value is None:
             return None
-        if key == "verb":
-            return Verb(value)
-        if key == "status":
-            return Status(value)
-        if key == "user":
-            return User(from_dict=value)
-        return value
+        deserializer = cls._slot_deserializers.get(key)
+        return value if deserializer is None else deserializer(value)
 
     def serialize(self):
         """Serialize the request object to a dictionary with plain data types"""
-        result = {}
-        for k in self.__slots__:
-            v = self.__getattribute__(k)
-            result[k] = self.serialize_slot(k, v)
-        return result
+        return {k: self.serialize_slot(k, v) for k, v in zip(self.__slots__, self._slot_values(self))}
 
     def deserialize(self, dict):
-        """Modify the request by deserializing a dictionary into it"""
+        """Modify the request by deserializing a dictionary into it, ignoring keys which are not request fields"""
+        slots = self._slot_set
         for k, v in dict.items():
-            self.__setattr__(k, self.deserialize_slot(k, v))
+            if k in slots:
+                self.__setattr__(k, self.deserialize_slot(k, v))
 
     def __eq__(self, other):
         if isinstance(other, Request):
@@ -128,4 +130,5 @@ class Request:
         return False
 
     def __hash__(self):
-        return uuid.UUID(self.id).int
+        # consistent with __eq__, and str caches its own hash
+        return hash(self.id)
@@ -72,7 +72,7 @@ def _visit(obj, fn):
 def _convert_numbers(obj, reverse=False):
     def fn(item):
         if not reverse and isinstance(item, float):
-            return Decimal(item)
+            return Decimal(repr(item))
         elif reverse and isinstance(item, Decimal):
             return float(item)
         return item
@@ -176,8 +176,7 @@ class DynamoDBRequestStore(request_store.RequestStore):
 
         if self.metric_store:
             items = self.metric_store.get_metrics(request_id=id)
-            for item in items:
-                self.metric_store.remove_metric(item.uuid)
+            self.metric_store.remove_metrics(item.uuid for item in items)
 
         logger.info("Request ID %s removed.", id)
 
@@ -32,6 +32,11 @@ from ..metric_collector import (
 from ..request import Request
 from . import request_store
 
+# Indexes serving a query on the given fields sorted by last_modified
+LAST_MODIFIED_INDEXES = {
+    frozenset(["user.id"]): "ix_user_last_modified",
+}
+
 
 class MongoRequestStore(request_store.RequestStore):
     def __init__(self, config=None, metric_store_config=None):
@@ -42,9 +47,12 @@ class MongoRequestStore(request_store.RequestStore):
         username = config.get("username")
         password = config.get("password")
 
-        self.mongo_client = mongo_client_factory.create_client(uri, username, password)
+        self.mongo_client = mongo_client_factory.create_client(
+            uri, username, password, **mongo_client_factory.pool_options(config)
+        )
         self.database = self.mongo_client.request_store
         self.store = self.database[request_collection]
+        self._ensure_indexes()
 
         self.metric_store = None
         if metric_store_config:
@@ -57,6 +65,13 @@ class MongoRequestStore(request_store.RequestStore):
 
         logging.info("MongoClient configured to open at {}".format(uri))
 
+    def _ensure_indexes(self):
+        indexes = {
+            # Requests of a user, most recently modified first
+            "ix_user_last_modified": ([("user.id", pymongo.ASCENDING), ("last_modified", pymongo.DESCENDING)], {}),
+        }
+        self.indexes = mongo_client_factory.ensure_indexes(self.store, indexes)
+
     def get_type(self):
         return "mongodb"
 
@@ -76,8 +91,7 @@ class MongoRequestStore(request_store.RequestStore):
             raise KeyError("Request does not exist in request store")
         if self.metric_store:
             res = self.metric_store.get_metrics(type=MetricType.REQUEST_STATUS_CHANGE, request_id=id)
-            for i in res:
-                self.metric_store.remove_metric(i.uuid)
+            self.metric_store.remove_metrics(i.uuid for i in res)
 
     def get_request(self, id):
         result = self.store.find_one({"id": id}, {"_id": False})
@@ -88,6 +102,13 @@ class MongoRequestStore(request_store.RequestStore):
             return None
 
     def get_requests(self, ascending=None, descending=None, limit=None, **kwargs):
+        return [Request(from_dict=i) for i in self._find(ascending, descending, limit, **kwargs)]
+
+    def iter_requests(self, ascending=None, descending=None, limit=None, **kwargs):
+        cursor = self._find(ascending, descending, limit, **kwargs).batch_size(256)
+        return mongo_client_factory.iter_documents(cursor, lambda i: Request(from_dict=i))
+
+    def _find(self, ascending=None, descending=None, limit=None, **kwargs):
         if ascending:
             if ascending not in Request.__slots__:
                 raise KeyError("Request has no key {}".format(ascending))
@@ -126,14 +147,10 @@ class MongoRequestStore(request_store.RequestStore):
         if limit is not None:
             cursor.limit(limit)
 
-        cursor_list = list(cursor)
-        if cursor_list:
-            res = []
-            for i in cursor_list:
-                request = Request(from_dict=i)
-                res.append(request)
-            return res
-        return []
+        if "last_modified" in (ascending, descending):
+            mongo_client_factory.hint_index(cursor, LAST_MODIFIED_INDEXES.get(frozenset(query)), self.indexes)
+
+        return cursor
 
     def update_request(self, request):
         request.last_modified = datetime.datetime.utcnow().timestamp()
@@ -157,6 +174,9 @@ class MongoRequestStore(request_store.RequestStore):
                 self.metric_store.remove_metric(type=MetricType.REQUEST_STATUS_CHANGE, request_id=i.id)
 
         self.database.drop_collection(self.store.name)
+        # dropping the collection dropped its indexes, which later queries hint
+        mongo_client_factory.forget_indexes(self.store)
+        self._ensure_indexes()
 
     def collect_metric_info(self):
         metric = self.request_store_metric_collector.collect().serialize()
@@ -20,7 +20,7 @@
 
 import importlib
 from abc import ABC, abstractmethod
-from typing import Dict, List, Union
+from typing import Dict, Iterator, List, Union
 
 from ..metric import MetricType
 from ..request import Request, Status
@@ -45,6 +45,10 @@ class RequestStore(ABC):
         """Returns [limit] requests which match kwargs, ordered by
         ascending/descenging keys (e.g. ascending = 'timestamp')"""
 
+    def iter_requests(self, ascending=None, descending=None, limit=None, **kwargs) -> Iterator[Request]:
+        """Same as get_requests, but yields requests as they are read instead of returning a list"""
+        return iter(self.get_requests(ascending=ascending, descending=descending, limit=limit, **kwargs))
+
     @abstractmethod
     def remove_request(self, id: str) -> None:
         """Remove a request from the request store"""
@@ -76,11 +80,10 @@ def create_request_store(request_store_config=None, metric_store_config=None):
     if request_store_config is None:
         request_store_config = {"mongodb": {}}
 
-    db_type = next(iter(request_store_config.keys()))
+    db_type, db_config = next(iter(request_store_config.items()))
 
-    assert db_type in type_to_class_map.keys()
+    if db_type not in type_to_class_map:
+        raise ValueError("Unsupported request store type {}".format(db_type))
 
     RequestStoreClass = importlib.import_module("polytope_server.common.request_store." + db_type + "_request_store")
-    return getattr(RequestStoreClass, type_to_class_map[db_type])(
-        request_store_config.get(db_type), metric_store_config
-    )
+    return getattr(RequestStoreClass, type_to_class_map[db_type])(db_config, metric_store_config)
@@ -18,9 +18,11 @@
 # does it submit to any jurisdiction.
 #
 
+import asyncio
 from typing import Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
 
 from ..common.metric import MetricType
 from .dependencies import get_auth, get_metric_store, get_request_store, get_staging
@@ -28,6 +30,29 @@ from .enums import StatusEnum
 
 router = APIRouter()
 
+ACTIVE_STATUSES = (
+    StatusEnum.WAITING,
+    StatusEnum.UPLOADING,
+    StatusEnum.QUEUED,
+    StatusEnum.PROCESSING,
+)
+
+
+async def collect_service_status(request_store, staging, auth, metric_store):
+    """Collect the metric info of each component concurrently, the backends being independent of each other"""
+    request_store_info, staging_info, auth_info, metric_store_info = await asyncio.gather(
+        run_in_threadpool(request_store.collect_metric_info),
+        run_in_threadpool(staging.collect_metric_info),
+        run_in_threadpool(auth.collect_metric_info),
+        run_in_threadpool(metric_store.collect_metric_info) if metric_store else asyncio.sleep(0),
+    )
+    return {
+        "request_store": request_store_info,
+        "staging": staging_info,
+        "auth": auth_info,
+        "metric_store": metric_store_info,
+    }
+
 
 @router.get("/telemetry/v1", summary="List available telemetry endpoints")
 async def list_endpoints():
@@ -46,12 +71,7 @@ async def service_status(
     auth=Depends(get_auth),
     metric_store=Depends(get_metric_store),
 ):
-    return {
-        "request_store": request_store.collect_metric_info(),
-        "staging": staging.collect_metric_info(),
-        "auth": auth.collect_metric_info(),
-        "metric_store": metric_store.collect_metric_info() if metric_store else None,
-    }
+    return await collect_service_status(request_store, staging, auth, metric_store)
 
 
 @router.get("/telemetry/v1/requests", summary="Get all requests")
@@ -61,18 +81,9 @@ async def all_requests(
     request_store=Depends(get_request_store),
     metric_store=Depends(get_metric_store),
 ):
-    active_statuses = {
-        StatusEnum.ACTIVE: [
-            StatusEnum.WAITING,
-            StatusEnum.UPLOADING,
-            StatusEnum.QUEUED,
-            StatusEnum.PROCESSING,
-        ]
-    }
-
     # Fetch requests based on status
     if status == StatusEnum.ACTIVE:
-        statuses = active_statuses[status]
+        statuses = ACTIVE_STATUSES
     elif status:
         statuses = [status]
     else:
@@ -109,15 +120,6 @@ async def user_requests(
     request_store=Depends(get_request_store),
     metric_store=Depends(get_metric_store),
 ):
-    active_statuses = {
-        StatusEnum.ACTIVE: [
-            StatusEnum.WAITING,
-            StatusEnum.UPLOADING,
-            StatusEnum.QUEUED,
-            StatusEnum.PROCESSING,
-        ]
-    }
-
     # TODO: implement more robust user fetching
     # Now we just fetch all requests and filter by user_id
     # Fetch all requests for the user
@@ -125,7 +127,7 @@ async def user_requests(
 
     # Apply status filtering
     if status == StatusEnum.ACTIVE:
-        statuses = active_statuses[status]
+        statuses = ACTIVE_STATUSES
     elif status:
         statuses = [status]
     else:
@@ -180,22 +182,11 @@ async def all_metrics(
     metric_store=Depends(get_metric_store),
 ):
     # Service status
-    service_status = {
-        "request_store": request_store.collect_metric_info(),
-        "staging": staging.collect_metric_info(),
-        "auth": auth.collect_metric_info(),
-        "metric_store": metric_store.collect_metric_info() if metric_store else None,
-    }
+    service_status = await collect_service_status(request_store, staging, auth, metric_store)
 
     # Active requests
     active_requests = []
-    active_statuses = [
-        StatusEnum.WAITING,
-        StatusEnum.UPLOADING,
-        StatusEnum.QUEUED,
-        StatusEnum.PROCESSING,
-    ]
-    for status in active_statuses:
+    for status in ACTIVE_STATUSES:
         query = {"status": status}
         active_requests += request_store.get_requests(**query)
 
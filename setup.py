@@ -40,6 +40,7 @@ setup(
     author_email="james.hawkes@ecmwf.int",
     packages=find_packages(),
     install_requires=requirements,
+    extras_require={"dax": ["amazon-dax-client"]},
     zip_safe=False,
     include_package_data=True,
 )
@@ -1,10 +1,12 @@
 import os
+import threading
 from unittest import mock
 
 import pytest
 from moto import mock_aws
 
-from polytope_server.common import request, user
+from polytope_server.common import metric, request, user
+from polytope_server.common.metric_store import dynamodb_metric_store
 from polytope_server.common.request_store import dynamodb_request_store
 
 
@@ -119,3 +121,89 @@ def test_metric_store(mocked_aws):
     store.add_request(r1)
     [m1] = store.metric_store.get_metrics()
     assert m1.request_id == r1.id
+
+
+@pytest.fixture(scope="function")
+def metric_store(mocked_aws):
+    return dynamodb_metric_store.DynamoDBMetricStore({"table_name": "metrics"})
+
+
+def test_metric_store_get_metrics_by_type(metric_store):
+    assert "type-index" in metric_store.indexes
+    m1 = metric.RequestStatusChange(request_id="request1", status=request.Status.QUEUED)
+    metric_store.add_metric(m1)
+    metric_store.add_metric(metric.WorkerInfo())
+    assert metric_store.get_metrics(type=metric.MetricType.REQUEST_STATUS_CHANGE) == [m1]
+
+
+def test_metric_store_get_metrics_by_type_sorted(metric_store):
+    m1, m2 = metric.WorkerInfo(timestamp=1.0), metric.WorkerInfo(timestamp=2.0)
+    for m in (m2, m1):
+        metric_store.add_metric(m)
+    assert metric_store.get_metrics(type=metric.MetricType.WORKER_INFO, ascending="timestamp") == [m1, m2]
+    assert metric_store.get_metrics(type=metric.MetricType.WORKER_INFO, descending="timestamp") == [m2, m1]
+
+
+def test_metric_store_get_metrics_limit(metric_store):
+    m1, m2, m3 = (metric.WorkerInfo(timestamp=t) for t in (1.0, 2.0, 3.0))
+    for m in (m2, m3, m1):
+        metric_store.add_metric(m)
+    assert len(metric_store.get_metrics(limit=2)) == 2
+    assert metric_store.get_metrics(descending="timestamp", limit=2) == [m3, m2]
+    assert metric_store.get_metrics(type=metric.MetricType.WORKER_INFO, ascending="timestamp", limit=2) == [m1, m2]
+
+
+def test_metric_store_removed_with_request(mocked_aws):
+    store = dynamodb_request_store.DynamoDBRequestStore(metric_store_config={"dynamodb": {"table_name": "metrics"}})
+    r1 = request.Request()
+    store.add_request(r1)
+    store.update_request(r1)
+    assert len(store.metric_store.get_metrics(request_id=r1.id)) == 2
+    store.remove_request(r1.id)
+    assert store.metric_store.get_metrics(request_id=r1.id) == []
+
+
+def test_metric_store_float_precision(metric_store):
+    m1 = metric.WorkerInfo(total_idle_time=0.1, total_processing_time=12.345)
+    metric_store.add_metric(m1)
+    m2 = metric_store.get_metric(m1.uuid)
+    assert m2.total_idle_time == 0.1
+    assert m2.total_processing_time == 12.345
+
+
+def test_metric_store_add_metric_duplicate(metric_store):
+    m1 = metric.WorkerInfo()
+    metric_store.add_metric(m1)
+    with pytest.raises(ValueError):
+        metric_store.add_metric(m1)
+    m1.update(requests_processed=3)
+    metric_store.update_metric(m1)
+    assert metric_store.get_metric(m1.uuid).requests_processed == 3
+
+
+def test_metric_store_get_metrics_filtered(mocked_aws):
+    store = dynamodb_request_store.DynamoDBRequestStore(metric_store_config={"dynamodb": {"table_name": "metrics"}})
+    r1 = request.Request()
+    store.add_request(r1)
+    r1.status = request.Status.QUEUED
+    store.update_request(r1)
+    [m1] = store.metric_store.get_metrics(request_id=r1.id, status=request.Status.QUEUED)
+    assert m1.status == request.Status.QUEUED
+    [m2] = store.metric_store.get_metrics(type=metric.MetricType.REQUEST_STATUS_CHANGE, status=request.Status.WAITING)
+    assert m2.request_id == r1.id
+
+
+def test_metric_store_table_per_thread(metric_store):
+    m1 = metric.WorkerInfo()
+    tables = []
+
+    def use_store():
+        tables.append(metric_store.table)
+        metric_store.add_metric(m1)
+
+    thread = threading.Thread(target=use_store)
+    thread.start()
+    thread.join()
+    assert metric_store.table is metric_store.table
+    assert tables[0] is not metric_store.table
+    assert metric_store.get_metrics(request_id=None, type=metric.MetricType.WORKER_INFO) == [m1]
@@ -1,9 +1,21 @@
 import typing
 from unittest import mock
 
+import pymongo
+import pytest
+
 from polytope_server.common import mongo_client_factory
 
 
+@pytest.fixture(autouse=True)
+def clear_client_cache():
+    mongo_client_factory._clients.clear()
+    mongo_client_factory._indexes.clear()
+    yield
+    mongo_client_factory._clients.clear()
+    mongo_client_factory._indexes.clear()
+
+
 @mock.patch("polytope_server.common.mongo_client_factory.pymongo.MongoClient", autospec=True)
 def test_create_without_credentials(mock_mongo: mock.Mock):
     mongo_client_factory.create_client("mongodb://host:123")
@@ -32,6 +44,89 @@ def test_create_with_credentials(mock_mongo: mock.Mock):
     _verify(mock_mongo, "mongodb+srv://host", "admin", "est123123")
 
 
+@mock.patch("polytope_server.common.mongo_client_factory.pymongo.MongoClient", autospec=True)
+def test_create_with_pool_options(mock_mongo: mock.Mock):
+    mongo_client_factory.create_client("mongodb://host:123", max_pool_size=10, min_pool_size=2)
+
+    _verify(mock_mongo, "mongodb://host:123", None, None)
+    args, kwargs = mock_mongo.call_args
+    assert kwargs["maxPoolSize"] == 10
+    assert kwargs["minPoolSize"] == 2
+    assert kwargs["maxIdleTimeMS"] == 60000
+
+
+@mock.patch("polytope_server.common.mongo_client_factory.pymongo.MongoClient", autospec=True)
+def test_create_reuses_client(mock_mongo: mock.Mock):
+    client = mongo_client_factory.create_client("mongodb://host:123", username="admin", password="pass")
+
+    assert mongo_client_factory.create_client("mongodb://host:123", username="admin", password="pass") is client
+    _verify(mock_mongo, "mongodb://host:123", "admin", "pass")
+
+    mongo_client_factory.create_client("mongodb://host:123")
+    assert mock_mongo.call_count == 2
+
+
+def test_ensure_indexes_refused():
+    collection = mock.MagicMock()
+    collection.create_index.side_effect = [pymongo.errors.OperationFailure("refused"), None]
+    indexes = {"ix_a": ([("a", 1)], {}), "ix_b": ([("b", 1)], {})}
+
+    assert mongo_client_factory.ensure_indexes(collection, indexes) == {"ix_b"}
+    assert mongo_client_factory.ensure_indexes(collection, indexes) == {"ix_b"}
+    assert collection.create_index.call_count == 2
+
+
+def test_ensure_indexes_retried_when_unreachable():
+    collection = mock.MagicMock()
+    collection.create_index.side_effect = [pymongo.errors.ServerSelectionTimeoutError("unreachable"), None, None]
+    indexes = {"ix_a": ([("a", 1)], {}), "ix_b": ([("b", 1)], {})}
+
+    assert mongo_client_factory.ensure_indexes(collection, indexes) == set()
+    assert collection.create_index.call_count == 1
+
+    assert mongo_client_factory.ensure_indexes(collection, indexes) == {"ix_a", "ix_b"}
+    assert collection.create_index.call_count == 3
+
+
+def test_pool_options_from_config():
+    config = {"uri": "mongodb://host", "collection": "requests", "max_pool_size": 10, "wait_queue_timeout_ms": 100}
+
+    assert mongo_client_factory.pool_options(config) == {"max_pool_size": 10, "wait_queue_timeout_ms": 100}
+
+
+def test_ensure_indexes_once_per_collection():
+    collection = mock.MagicMock()
+    indexes = {"ix_a": ([("a", 1)], {}), "ix_b": ([("b", 1)], {"unique": True})}
+
+    assert mongo_client_factory.ensure_indexes(collection, indexes) == {"ix_a", "ix_b"}
+    assert mongo_client_factory.ensure_indexes(collection, indexes) == {"ix_a", "ix_b"}
+    assert collection.create_index.call_count == 2
+
+    mongo_client_factory.forget_indexes(collection)
+    mongo_client_factory.ensure_indexes(collection, indexes)
+    assert collection.create_index.call_count == 4
+
+
+def test_hint_index_only_if_it_exists():
+    cursor = mock.MagicMock()
+
+    assert not mongo_client_factory.hint_index(cursor, "ix_b", {"ix_a"})
+    assert not mongo_client_factory.hint_index(cursor, None, {"ix_a"})
+    cursor.hint.assert_not_called()
+
+    assert mongo_client_factory.hint_index(cursor, "ix_a", {"ix_a"})
+    cursor.hint.assert_called_once_with("ix_a")
+
+
+def test_iter_documents_is_lazy():
+    build = mock.Mock(side_effect=lambda document: document["a"])
+
+    documents = mongo_client_factory.iter_documents(iter([{"a": 1}, {"a": 2}]), build)
+    build.assert_not_called()
+
+    assert list(documents) == [1, 2]
+
+
 def _verify(
     mock_mongo: mock.Mock, endpoint: str, username: typing.Optional[str] = None, password: typing.Optional[str] = None
 ):
@@ -0,0 +1,108 @@
+from unittest import mock
+
+import pymongo
+import pytest
+
+from polytope_server.common import metric, mongo_client_factory
+from polytope_server.common.metric_store import mongodb_metric_store
+
+
+@pytest.fixture(scope="function")
+def store():
+    mongo_client_factory._indexes.clear()
+    with mock.patch.object(mongo_client_factory, "create_client", return_value=mock.MagicMock()):
+        yield mongodb_metric_store.MongoMetricStore({"collection": "metrics"})
+    mongo_client_factory._indexes.clear()
+
+
+def test_add_metrics(store: mongodb_metric_store.MongoMetricStore):
+    metrics = [metric.WorkerInfo(status="idle"), metric.WorkerInfo(status="processing")]
+
+    store.add_metrics(metrics)
+
+    store.store.insert_many.assert_called_once_with([m.serialize() for m in metrics], ordered=False)
+
+
+def test_add_metrics_empty(store: mongodb_metric_store.MongoMetricStore):
+    store.add_metrics([])
+
+    store.store.insert_many.assert_not_called()
+
+
+def test_add_metrics_duplicate(store: mongodb_metric_store.MongoMetricStore):
+    store.store.insert_many.side_effect = pymongo.errors.BulkWriteError(
+        {"writeErrors": [{"index": 1, "code": 11000, "errmsg": "duplicate key"}]}
+    )
+
+    with pytest.raises(ValueError, match="1 of 2 metrics"):
+        store.add_metrics([metric.WorkerInfo(), metric.WorkerInfo()])
+
+
+def test_add_metrics_other_error(store: mongodb_metric_store.MongoMetricStore):
+    store.store.insert_many.side_effect = pymongo.errors.BulkWriteError(
+        {
+            "writeErrors": [
+                {"index": 0, "code": 11000, "errmsg": "duplicate key"},
+                {"index": 1, "code": 121, "errmsg": "document failed validation"},
+            ]
+        }
+    )
+
+    with pytest.raises(pymongo.errors.BulkWriteError):
+        store.add_metrics([metric.WorkerInfo(), metric.WorkerInfo()])
+
+
+def test_add_metrics_without_unique_index(store: mongodb_metric_store.MongoMetricStore):
+    store.unique_uuid = False
+    store.store.find_one.side_effect = [None, {"_id": 1}]
+    m1, m2 = metric.WorkerInfo(), metric.WorkerInfo()
+
+    # each metric is checked then inserted on its own, stopping at the first duplicate
+    with pytest.raises(ValueError):
+        store.add_metrics([m1, m2])
+
+    store.store.insert_many.assert_not_called()
+    store.store.insert_one.assert_called_once_with(m1.serialize())
+
+
+def test_update_metrics(store: mongodb_metric_store.MongoMetricStore):
+    m1, m2 = metric.WorkerInfo(status="idle"), metric.WorkerInfo(status="processing")
+
+    store.update_metrics([m1, m2])
+
+    store.store.bulk_write.assert_called_once_with(
+        [
+            pymongo.UpdateOne({"uuid": m1.uuid}, {"$set": m1.serialize()}),
+            pymongo.UpdateOne({"uuid": m2.uuid}, {"$set": m2.serialize()}),
+        ],
+        ordered=False,
+    )
+
+
+def test_update_metric(store: mongodb_metric_store.MongoMetricStore):
+    m = metric.WorkerInfo(status="idle")
+
+    store.update_metric(m)
+
+    store.store.bulk_write.assert_called_once_with(
+        [pymongo.UpdateOne({"uuid": m.uuid}, {"$set": m.serialize()})], ordered=False
+    )
+
+
+def test_update_metrics_empty(store: mongodb_metric_store.MongoMetricStore):
+    store.update_metrics([])
+
+    store.store.bulk_write.assert_not_called()
+
+
+def test_get_metrics_filtered(store: mongodb_metric_store.MongoMetricStore):
+    m = metric.WorkerInfo(status="idle")
+    store.store.find.return_value.batch_size.return_value = [m.serialize()]
+
+    assert [i.uuid for i in store.get_metrics(type=metric.MetricType.WORKER_INFO)] == [m.uuid]
+    store.store.find.assert_called_once_with({"type": "worker_info"}, {"_id": False})
+
+
+def test_iter_metrics_unknown_key(store: mongodb_metric_store.MongoMetricStore):
+    with pytest.raises(KeyError):
+        store.iter_metrics(unknown="value")
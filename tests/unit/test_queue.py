@@ -0,0 +1,15 @@
+from polytope_server.common.queue import queue
+
+
+def test_body_round_trip():
+    body = {"id": "123", "collection": "debug", "request": "class: od\nstream: oper", "priority": 1.5, "tags": [None]}
+
+    data = queue.encode_body(body)
+
+    assert isinstance(data, bytes)
+    assert queue.decode_body(data) == body
+    assert queue.decode_body(data.decode("utf-8")) == body
+
+
+def test_body_non_str_keys():
+    assert queue.decode_body(queue.encode_body({1: "a"})) == {"1": "a"}
@@ -67,6 +67,14 @@ class Test:
         assert r3.status == r1.status
         assert r2.user == self.user
 
+    def test_request_deserialize_ignores_unknown_keys(self):
+        r1 = request.Request(user=self.user, verb=request.Verb.RETRIEVE)
+        d = r1.serialize()
+        d["_id"] = "stored-by-backend"
+        r2 = request.Request(from_dict=d)
+        assert r2 == r1
+        assert r2.serialize() == r1.serialize()
+
     def test_request_copy(self):
         r1 = request.Request(user=self.user, verb=request.Verb.RETRIEVE)
         r2 = deepcopy(r1)
@@ -0,0 +1,108 @@
+import os
+import time
+from unittest import mock
+
+import boto3
+import botocore.exceptions
+import pytest
+from moto import mock_aws
+
+from polytope_server.common.queue import queue, sqs_queue
+
+
+@pytest.fixture(scope="function")
+def aws_credentials():
+    """Mocked AWS Credentials for moto."""
+    values = {
+        "AWS_ACCESS_KEY_ID": "testing",
+        "AWS_SECRET_ACCESS_KEY": "testing",
+        "AWS_SECURITY_TOKEN": "testing",
+        "AWS_SESSION_TOKEN": "testing",
+        "AWS_DEFAULT_REGION": "us-east-1",
+    }
+    with mock.patch.dict(os.environ, values):
+        yield
+
+
+@pytest.fixture(scope="function")
+def mocked_aws(aws_credentials):
+    with mock_aws():
+        boto3.client("sqs", region_name="us-east-1").create_queue(
+            QueueName="requests.fifo", Attributes={"FifoQueue": "true", "ContentBasedDeduplication": "true"}
+        )
+        yield
+
+
+def make_queue(**config):
+    config = {"queue_name": "requests.fifo", "region": "us-east-1", "wait_time_seconds": 0, **config}
+    return sqs_queue.SQSQueue(config)
+
+
+def enqueue(q, *ids):
+    for i in ids:
+        q.enqueue(queue.Message({"id": i}))
+
+
+def test_dequeue_one_at_a_time(mocked_aws):
+    q = make_queue()
+    enqueue(q, "a", "b")
+
+    assert q.dequeue().body == {"id": "a"}
+    assert not q.buffer
+    assert q.dequeue().body == {"id": "b"}
+    assert q.dequeue() is None
+
+
+def test_dequeue_buffered_in_order(mocked_aws):
+    q = make_queue(max_number_of_messages=10)
+    enqueue(q, "a", "b", "c")
+
+    assert q.dequeue().body == {"id": "a"}
+    assert len(q.buffer) == 2
+    assert q.dequeue().body == {"id": "b"}
+    assert q.dequeue().body == {"id": "c"}
+    assert q.dequeue() is None
+
+
+def test_dequeue_skips_expired(mocked_aws):
+    q = make_queue(max_number_of_messages=10)
+    enqueue(q, "a", "b", "c")
+
+    q.dequeue()
+    # the visibility timeout of "b" ran out while it waited in the buffer
+    received, msg = q.buffer[0]
+    q.buffer[0] = (received - q.visibility_timeout, msg)
+
+    assert q.dequeue().body == {"id": "c"}
+    assert not q.buffer
+
+
+def test_close_releases_buffered(mocked_aws):
+    q = make_queue(max_number_of_messages=10)
+    enqueue(q, *"abcdefghijkl")
+
+    assert q.dequeue().body == {"id": "a"}
+    assert len(q.buffer) == 9
+    # buffer more than a batch of releases
+    response = q.client.receive_message(QueueUrl=q.queue_url, MaxNumberOfMessages=10, VisibilityTimeout=120)
+    q.buffer.extend((time.monotonic(), msg) for msg in response["Messages"])
+    assert len(q.buffer) == 11
+    q.close_connection()
+    assert not q.buffer
+
+    # released messages are visible again straight away, unlike "a" which is still being processed
+    other = make_queue(max_number_of_messages=10)
+    received = [other.dequeue().body["id"] for _ in range(11)]
+    assert sorted(received) == list("bcdefghijkl")
+    assert other.dequeue() is None
+
+
+def test_close_release_failure(mocked_aws):
+    q = make_queue(max_number_of_messages=10)
+    enqueue(q, "a", "b")
+    q.dequeue()
+
+    error = botocore.exceptions.ClientError({"Error": {"Code": "InternalError"}}, "ChangeMessageVisibilityBatch")
+    with mock.patch.object(q.client, "change_message_visibility_batch", side_effect=error):
+        q.close_connection()
+    assert not q.buffer
@@ -0,0 +1,90 @@
+from types import SimpleNamespace
+from unittest import mock
+
+from polytope_server.common.metric_collector.storage_metric_collector import (
+    DictStorageMetricCollector,
+    S3StorageMetricCollector,
+    SizedDict,
+)
+
+
+def test_s3_collect_lists_bucket_once():
+    client = mock.Mock()
+    client.get_paginator.return_value.paginate.return_value = [
+        {"KeyCount": 2, "Contents": [{"Size": 10}, {"Size": 20}]},
+        {"KeyCount": 1, "Contents": [{"Size": 5}]},
+    ]
+    collector = S3StorageMetricCollector("host", client, "bucket", "S3DataStaging_boto3")
+
+    info = collector.collect()
+
+    assert info.entries == 3
+    assert info.bucket_space_used == 35
+    assert info.bucket_name == "bucket"
+    client.get_paginator.return_value.paginate.assert_called_once_with(Bucket="bucket")
+
+
+def test_s3_collect_empty_bucket():
+    client = mock.Mock()
+    client.get_paginator.return_value.paginate.return_value = [{"KeyCount": 0}]
+    collector = S3StorageMetricCollector("host", client, "bucket", "S3DataStaging_boto3")
+
+    info = collector.collect()
+
+    assert info.entries == 0
+    assert info.bucket_space_used == 0
+
+
+def test_minio_collect_lists_bucket_once():
+    client = mock.Mock()
+    client.list_objects.return_value = [SimpleNamespace(size=10), SimpleNamespace(size=20)]
+    collector = S3StorageMetricCollector("host", client, "bucket", "S3DataStaging")
+
+    info = collector.collect()
+
+    assert info.entries == 2
+    assert info.bucket_space_used == 30
+    client.list_objects.assert_called_once_with("bucket")
+
+
+def test_sized_dict_accounting():
+    d = SizedDict(sizeof=len)
+
+    d["a"] = "xx"
+    d["b"] = "yyy"
+    assert d.size == 5
+    d["a"] = "x"
+    assert d.size == 4
+    del d["a"]
+    assert d.size == 3
+    assert d.pop("b") == "yyy"
+    assert d.size == 0
+    assert d.pop("b", None) is None
+
+    d.update({"a": "xx"}, b="y")
+    d.setdefault("c", "zzz")
+    d.setdefault("c", "zzzzzz")
+    assert d.size == 6
+    _, value = d.popitem()
+    assert d.size == 6 - len(value)
+    d.clear()
+    assert d.size == 0
+    assert len(d) == 0
+
+
+def test_sized_dict_initial_items():
+    d = SizedDict({"a": "xx"}, sizeof=len, b="y")
+
+    assert dict(d) == {"a": "xx", "b": "y"}
+    assert d.size == 3
+
+
+def test_dict_storage_space_used():
+    d = SizedDict(sizeof=len)
+    d["a"] = "xx"
+    collector = DictStorageMetricCollector("host", d)
+
+    assert collector.storage_space_used() == 2
+    assert collector.total_entries() == 1
+    d["b"] = "yyyy"
+    assert collector.collect().storage_space_used == 6